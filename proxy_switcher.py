@@ -6,17 +6,40 @@ Clash Verge Proxy Switcher
 - Switch profile and proxy node via mihomo API
 """
 
+import bisect
+import copy
+import functools
+import heapq
+import http.client
+import itertools
 import json
 import os
+import queue
+import re
 import sys
+import threading
 import time
-import urllib.request
-import urllib.error
 import urllib.parse
 import yaml
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
 
 def load_dotenv():
     """Load .env file from the same directory as this script."""
@@ -46,6 +69,14 @@ PROFILES_YAML = VERGE_DIR / "profiles.yaml"
 
 # Nodes with these keywords in name are info-only, not real proxies
 INFO_KEYWORDS = ["剩余流量", "距离下次", "套餐到期", "过期时间", "到期时间", "官网"]
+_INFO_RE = re.compile("|".join(re.escape(kw) for kw in INFO_KEYWORDS))
+
+# Delay coloring: green < 300ms <= yellow < 800ms <= red
+_DELAY_THRESHOLDS = (300, 800)
+_DELAY_COLORS = ("\033[32m", "\033[33m", "\033[31m")
+
+# mihomo proxy types that are groups or built-ins rather than real nodes
+_NON_NODE_TYPES = frozenset({"Selector", "Direct", "Reject", "RejectDrop", "Pass", "Compatible"})
 
 HEADERS = {
     "Authorization": f"Bearer {CLASH_SECRET}",
@@ -53,25 +84,127 @@ HEADERS = {
 }
 
 
-def api_request(path, method="GET", data=None):
-    url = f"{CLASH_API}{path}"
-    body = json.dumps(data).encode() if data else None
-    req = urllib.request.Request(url, data=body, headers=HEADERS, method=method)
+def _is_real_node(name, info):
+    return info.get("type") not in _NON_NODE_TYPES and not _INFO_RE.search(name)
+
+
+_API_URL = urllib.parse.urlsplit(CLASH_API)
+_API_PREFIX = _API_URL.path.rstrip("/")
+
+# Keep-alive connections shared by all threads. Each slot holds an open
+# connection or None (not connected yet); a request blocks until a slot is free,
+# so at most API_POOL_SIZE sockets are ever open.
+API_POOL_SIZE = 32
+_pool = queue.LifoQueue(maxsize=API_POOL_SIZE)
+for _ in range(API_POOL_SIZE):
+    _pool.put(None)
+
+
+def _new_connection():
+    if _API_URL.scheme == "https":
+        return http.client.HTTPSConnection(_API_URL.hostname, _API_URL.port, timeout=10)
+    return http.client.HTTPConnection(_API_URL.hostname, _API_URL.port, timeout=10)
+
+
+def _send(method, path, body):
+    """Send a request on a pooled connection, reconnecting once if it went stale."""
+    conn = _pool.get()
+    try:
+        for attempt in range(2):
+            if conn is None:
+                conn = _new_connection()
+            try:
+                conn.request(method, _API_PREFIX + path, body=body, headers=HEADERS)
+                resp = conn.getresponse()
+                return resp.status, resp.read()
+            except Exception as e:
+                conn.close()
+                conn = None
+                if attempt or not isinstance(e, ConnectionError):
+                    raise
+    finally:
+        _pool.put(conn)
+
+
+def _decode_response(status, payload):
+    if status >= 400:
+        return {"error": status, "message": payload.decode()}
+    if status == 204:
+        return None
+    return _loads(payload)
+
+
+def _api_get(path):
+    """Fast path for the common body-less GET."""
+    try:
+        return _decode_response(*_send("GET", path, None))
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _api_send(path, method, data):
+    invalidate_cache()
+    body = _dumps(data) if data else None
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            if resp.status == 204:
-                return None
-            return json.loads(resp.read().decode())
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        return {"error": e.code, "message": body}
+        return _decode_response(*_send(method, path, body))
     except Exception as e:
         return {"error": str(e)}
 
 
+def api_request(path, method="GET", data=None):
+    if method == "GET" and data is None:
+        return _api_get(path)
+    return _api_send(path, method, data)
+
+
+# Successful GET responses, reused for the rest of the command until a write
+_GET_CACHE = {}
+
+
+def api_get_cached(path):
+    """GET `path`, reusing an earlier response from this process if there is one."""
+    result = _GET_CACHE.get(path)
+    if result is None:
+        result = _api_get(path)
+        if result and "error" not in result:
+            _GET_CACHE[path] = result
+    return result
+
+
+def invalidate_cache():
+    _GET_CACHE.clear()
+
+
+# Parsed YAML files keyed by path, validated against (st_mtime_ns, st_size)
+_YAML_CACHE = OrderedDict()
+_YAML_CACHE_MAX = 100
+_YAML_CACHE_LOCK = threading.Lock()
+
+
+def _load_yaml_cached(path):
+    """Parse a YAML file, reusing the previous result while the file is unchanged.
+
+    The returned object is shared with the cache; callers must not mutate it.
+    """
+    key = str(path)
+    st = os.stat(key)
+    with _YAML_CACHE_LOCK:
+        cached = _YAML_CACHE.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            _YAML_CACHE.move_to_end(key)
+            return cached[2]
+    with open(key) as f:
+        data = yaml.load(f, Loader=_SafeLoader)
+    with _YAML_CACHE_LOCK:
+        _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+        _YAML_CACHE.move_to_end(key)
+        if len(_YAML_CACHE) > _YAML_CACHE_MAX:
+            _YAML_CACHE.popitem(last=False)
+    return data
+
+
 def load_profiles_yaml():
-    with open(PROFILES_YAML) as f:
-        return yaml.safe_load(f)
+    return _load_yaml_cached(PROFILES_YAML)
 
 
 def get_remote_profiles():
@@ -91,16 +224,58 @@ def get_remote_profiles():
     return profiles
 
 
+def _read_profile_sidecar(filepath):
+    """Return the proxies list from the JSON sidecar, or None if it is missing or stale."""
+    try:
+        st = os.stat(filepath)
+        with open(filepath.with_suffix(".yaml.json"), encoding="utf-8") as f:
+            cached = json.load(f)
+        # Same (st_mtime_ns, st_size) validation as _load_yaml_cached
+        if cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+            return cached["proxies"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _load_profile_cached(filepath):
+    """Return the `proxies` list of a profile, via a JSON sidecar next to the YAML.
+
+    The sidecar (`<file>.yaml.json`) records the (st_mtime_ns, st_size) the
+    YAML had before it was parsed and is reused only while the YAML still
+    matches; otherwise the YAML is parsed and the sidecar rewritten.
+    """
+    cache_path = filepath.with_suffix(".yaml.json")
+    proxies = _read_profile_sidecar(filepath)
+    if proxies is not None:
+        return proxies
+
+    # Stat before parsing: if the YAML is rewritten meanwhile, the key won't match
+    st = os.stat(filepath)
+    proxies = (_load_yaml_cached(filepath) or {}).get("proxies") or []
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    cached = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "proxies": proxies}
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cached, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # Cache is best-effort (read-only dir, non-JSON values such as dates)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    return proxies
+
+
 def parse_profile_nodes(profile):
     filepath = PROFILES_DIR / profile["file"]
     if not filepath.exists():
         return []
-    with open(filepath) as f:
-        data = yaml.safe_load(f)
     nodes = []
-    for p in data.get("proxies", []):
+    for p in _load_profile_cached(filepath):
         name = p.get("name", "")
-        if any(kw in name for kw in INFO_KEYWORDS):
+        if _INFO_RE.search(name):
             continue
         nodes.append({
             "name": name,
@@ -113,40 +288,112 @@ def parse_profile_nodes(profile):
     return nodes
 
 
-def test_single_node_delay(node_name, timeout=3000, test_url="https://www.gstatic.com/generate_204"):
-    encoded = urllib.parse.quote(node_name, safe="")
-    path = f"/proxies/{encoded}/delay?timeout={timeout}&url={urllib.parse.quote(test_url, safe='')}"
-    result = api_request(path)
+def _count_profile_nodes(profile):
+    """Count a profile's real nodes without building the node list."""
+    filepath = PROFILES_DIR / profile["file"]
+    if not filepath.exists():
+        return 0
+    return sum(1 for p in _load_profile_cached(filepath) if not _INFO_RE.search(p.get("name", "")))
+
+
+DELAY_TEST_URL = "https://www.gstatic.com/generate_204"
+_ENCODED_TEST_URL = urllib.parse.quote(DELAY_TEST_URL, safe="")
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_node(name):
+    return urllib.parse.quote(name, safe="")
+
+
+def _quote_test_url(test_url):
+    if test_url == DELAY_TEST_URL:
+        return _ENCODED_TEST_URL
+    return urllib.parse.quote(test_url, safe="")
+
+
+def test_single_node_delay(node_name, timeout=3000, test_url=DELAY_TEST_URL):
+    path = f"/proxies/{_quote_node(node_name)}/delay?timeout={timeout}&url={_quote_test_url(test_url)}"
+    result = _api_get(path)
     if result and "delay" in result:
         return result["delay"]
     return -1
 
 
+# Whether mihomo serves /group/{name}/delay; None until the first attempt
+_group_delay_supported = None
+
+
+def test_group_delay(group, timeout=3000, test_url=DELAY_TEST_URL):
+    """Test every member of a group in one request.
+
+    Returns {name: delay_ms} for the members that responded, or None if the
+    group test failed or the core does not support it (older mihomo versions).
+    """
+    global _group_delay_supported
+    encoded = urllib.parse.quote(group, safe="")
+    path = f"/group/{encoded}/delay?timeout={timeout}&url={_quote_test_url(test_url)}"
+    result = _api_get(path)
+    error = result.get("error") if isinstance(result, dict) else "unexpected response"
+    if error == 404:
+        _group_delay_supported = False
+        return None
+    if error == 504:
+        # mihomo answers 504 when every member timed out
+        _group_delay_supported = True
+        return {}
+    if error is not None:
+        return None
+    _group_delay_supported = True
+    return result
+
+
+# One worker per pooled connection; more would only queue for a free slot
+MAX_PROBE_WORKERS = API_POOL_SIZE
+
+
+def test_nodes_delay(names, group=None):
+    """Test all nodes, returning {name: delay_ms} (-1 on failure).
+
+    If every name is a member of `group`, the whole group is tested in one
+    request; otherwise (or if that fails) each node is probed concurrently.
+    """
+    names = list(names)
+    if not names:
+        return {}
+    if group and _group_delay_supported is not False:
+        delays = test_group_delay(group)
+        if delays is not None:
+            return {name: delays.get(name, -1) for name in names}
+    with ThreadPoolExecutor(max_workers=min(MAX_PROBE_WORKERS, len(names))) as pool:
+        return dict(zip(names, pool.map(test_single_node_delay, names)))
+
+
 def cmd_list():
     profiles = get_remote_profiles()
-    all_nodes = []
-    for p in profiles:
-        nodes = parse_profile_nodes(p)
-        all_nodes.extend(nodes)
+    all_node_lists = [parse_profile_nodes(p) for p in profiles]
+    by_uid = {p["uid"]: nodes for p, nodes in zip(profiles, all_node_lists)}
+    all_nodes = list(itertools.chain.from_iterable(all_node_lists))
 
-    print(f"\n{'='*80}")
-    print(f" Clash Verge Proxy Nodes — {len(all_nodes)} total across {len(profiles)} profiles")
-    print(f"{'='*80}\n")
+    out = []
+    out.append(f"\n{'='*80}")
+    out.append(f" Clash Verge Proxy Nodes — {len(all_nodes)} total across {len(profiles)} profiles")
+    out.append(f"{'='*80}\n")
 
     for p in profiles:
         marker = " ★ ACTIVE" if p["active"] else ""
-        nodes = [n for n in all_nodes if n["profile_uid"] == p["uid"]]
+        nodes = by_uid[p["uid"]]
         extra = ""
         if p.get("extra"):
             e = p["extra"]
             used = (e.get("upload", 0) + e.get("download", 0)) / 1024**3
             total = e.get("total", 0) / 1024**3
             extra = f"  [{used:.1f}/{total:.0f} GB]"
-        print(f"  [{p['uid'][:8]}] {p['name']}{marker}{extra}")
-        print(f"  {'—'*60}")
+        out.append(f"  [{p['uid'][:8]}] {p['name']}{marker}{extra}")
+        out.append(f"  {'—'*60}")
         for i, n in enumerate(nodes, 1):
-            print(f"    {i:>2}. {n['name']:<45} {n['type']:<12} {n['server']}")
-        print()
+            out.append(f"    {i:>2}. {n['name']:<45} {n['type']:<12} {n['server']}")
+        out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def cmd_test(profile_filter=None):
@@ -157,7 +404,7 @@ def cmd_test(profile_filter=None):
         return
 
     # Get currently loaded proxies from mihomo
-    result = api_request("/proxies")
+    result = api_get_cached("/proxies")
     if not result or "proxies" in result and not result["proxies"]:
         print("Error: cannot fetch proxies from mihomo API")
         return
@@ -166,50 +413,61 @@ def cmd_test(profile_filter=None):
     # Filter to actual proxy nodes (not groups/special)
     real_nodes = {
         name: info for name, info in proxies.items()
-        if info.get("type") not in ("Selector", "Direct", "Reject", "RejectDrop", "Pass", "Compatible")
-        and not any(kw in name for kw in INFO_KEYWORDS)
+        if _is_real_node(name, info)
     }
 
     print(f"\n Testing {len(real_nodes)} nodes from active profile [{active['name']}]...\n")
 
-    results = []
-    with ThreadPoolExecutor(max_workers=16) as pool:
-        futures = {pool.submit(test_single_node_delay, name): name for name in real_nodes}
-        for future in as_completed(futures):
-            name = futures[future]
-            delay = future.result()
-            results.append((name, real_nodes[name]["type"], delay))
+    # GLOBAL holds every loaded proxy, so one group test covers them all
+    global_members = proxies.get("GLOBAL", {}).get("all", [])
+    group = "GLOBAL" if set(real_nodes) <= set(global_members) else None
+    delays = test_nodes_delay(real_nodes, group=group)
+    results = [(name, real_nodes[name]["type"], delay) for name, delay in delays.items()]
 
     # Sort: available first (by delay), then unavailable
     results.sort(key=lambda x: (x[2] < 0, x[2]))
 
-    print(f"  {'#':>3}  {'Node':<50} {'Type':<12} {'Delay':>8}")
-    print(f"  {'—'*78}")
+    out = []
+    out.append(f"  {'#':>3}  {'Node':<50} {'Type':<12} {'Delay':>8}")
+    out.append(f"  {'—'*78}")
     for i, (name, ntype, delay) in enumerate(results, 1):
         if delay >= 0:
             delay_str = f"{delay}ms"
-            color = "\033[32m" if delay < 300 else "\033[33m" if delay < 800 else "\033[31m"
-            print(f"  {i:>3}  {name:<50} {ntype:<12} {color}{delay_str:>8}\033[0m")
+            color = _DELAY_COLORS[bisect.bisect_right(_DELAY_THRESHOLDS, delay)]
+            out.append(f"  {i:>3}  {name:<50} {ntype:<12} {color}{delay_str:>8}\033[0m")
         else:
-            print(f"  {i:>3}  {name:<50} {ntype:<12} \033[90m timeout\033[0m")
+            out.append(f"  {i:>3}  {name:<50} {ntype:<12} \033[90m timeout\033[0m")
 
     available = [r for r in results if r[2] >= 0]
-    print(f"\n  {len(available)}/{len(results)} nodes available", end="")
+    summary = f"\n  {len(available)}/{len(results)} nodes available"
     if available:
         best = available[0]
-        print(f" | Best: {best[0]} ({best[2]}ms)")
-    else:
-        print()
+        summary += f" | Best: {best[0]} ({best[2]}ms)"
+    out.append(summary)
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+def _wait_ready(timeout=2.0):
+    """Poll /version until mihomo answers, returning the response (None on timeout)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        ver = _api_get("/version")
+        if ver and "version" in ver:
+            return ver
+        time.sleep(0.05)
+    return None
 
 
 def cmd_switch_profile(target):
     profiles = get_remote_profiles()
-    # Match by name (partial) or uid
-    match = None
-    for p in profiles:
-        if target.lower() in p["name"].lower() or target.lower() in p["uid"].lower():
-            match = p
-            break
+    # Match by uid prefix (as shown by `list`) first, then by name or uid (partial)
+    match = next((p for p in profiles if p["uid"].startswith(target)), None)
+    if not match:
+        tgt = target.lower()
+        for p in profiles:
+            if tgt in p["name"].lower() or tgt in p["uid"].lower():
+                match = p
+                break
 
     if not match:
         print(f"Error: profile '{target}' not found. Available:")
@@ -224,10 +482,10 @@ def cmd_switch_profile(target):
     print(f"Switching to profile [{match['name']}] (uid: {match['uid']})...")
 
     # Step 1: Update profiles.yaml
-    data = load_profiles_yaml()
+    data = copy.deepcopy(load_profiles_yaml())
     data["current"] = match["uid"]
     with open(PROFILES_YAML, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+        yaml.dump(data, f, Dumper=_SafeDumper, default_flow_style=False, allow_unicode=True)
 
     # Step 2: Load the profile yaml directly into mihomo
     profile_path = str(PROFILES_DIR / match["file"])
@@ -235,18 +493,21 @@ def cmd_switch_profile(target):
 
     if result is None:  # 204 = success
         print(f"  mihomo config reloaded from {match['file']}")
-        # Verify
-        time.sleep(1)
-        ver = api_request("/version")
+        # Verify, fetching the (large) proxy list in parallel for the summary
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            f_proxies = pool.submit(api_get_cached, "/proxies")
+            ver = _wait_ready()
+            proxies = f_proxies.result()
         if ver:
             print(f"  mihomo {ver.get('version', '?')} running OK")
+        if not proxies or "error" in proxies:
+            # The prefetch raced the reload; retry now that the core is up
+            proxies = api_get_cached("/proxies")
         # Show loaded proxies
-        proxies = api_request("/proxies")
-        if proxies:
+        if proxies and "proxies" in proxies:
             real = [
                 name for name, info in proxies["proxies"].items()
-                if info.get("type") not in ("Selector", "Direct", "Reject", "RejectDrop", "Pass", "Compatible")
-                and not any(kw in name for kw in INFO_KEYWORDS)
+                if _is_real_node(name, info)
             ]
             print(f"  {len(real)} proxy nodes loaded")
         print(f"\n  NOTE: Clash Verge GUI may still show the old profile.")
@@ -280,92 +541,95 @@ def cmd_switch_node(node_name, group="Proxies"):
 def cmd_best(group="Proxies"):
     """Auto-select the best (lowest latency) node in a group."""
     encoded = urllib.parse.quote(group, safe="")
-    info = api_request(f"/proxies/{encoded}")
+    # The full snapshot already contains the group, so one request serves both
+    proxies = api_get_cached("/proxies") or {}
+    info = (proxies.get("proxies") or {}).get(group)
     if not info or "all" not in info:
         print(f"Error: cannot read group [{group}]")
         return
 
     candidates = [
         n for n in info["all"]
-        if not any(kw in n for kw in INFO_KEYWORDS)
+        if not _INFO_RE.search(n)
         and n not in ("DIRECT", "REJECT", "PASS")
         # Exclude sub-groups (they are also selectors)
     ]
 
     # Check which are actual nodes vs sub-groups
-    proxies = api_request("/proxies")
     actual_nodes = []
     for name in candidates:
         pinfo = proxies["proxies"].get(name, {})
-        if pinfo.get("type") not in ("Selector", "Direct", "Reject", "RejectDrop", "Pass", "Compatible"):
+        if pinfo.get("type") not in _NON_NODE_TYPES:
             actual_nodes.append(name)
 
     print(f"\n Testing {len(actual_nodes)} nodes in [{group}]...\n")
 
-    results = []
-    with ThreadPoolExecutor(max_workers=16) as pool:
-        futures = {pool.submit(test_single_node_delay, name): name for name in actual_nodes}
-        for future in as_completed(futures):
-            name = futures[future]
-            delay = future.result()
-            results.append((name, delay))
+    results = list(test_nodes_delay(actual_nodes, group=group).items())
 
-    results.sort(key=lambda x: (x[1] < 0, x[1]))
-    available = [(n, d) for n, d in results if d >= 0]
+    # Only the top 10 are shown, so a partial order is enough
+    top = heapq.nsmallest(10, results, key=lambda x: (x[1] < 0, x[1]))
 
-    for i, (name, delay) in enumerate(results[:10], 1):
+    out = []
+    for i, (name, delay) in enumerate(top, 1):
         if delay >= 0:
-            color = "\033[32m" if delay < 300 else "\033[33m" if delay < 800 else "\033[31m"
-            print(f"  {i:>2}. {name:<50} {color}{delay}ms\033[0m")
+            color = _DELAY_COLORS[bisect.bisect_right(_DELAY_THRESHOLDS, delay)]
+            out.append(f"  {i:>2}. {name:<50} {color}{delay}ms\033[0m")
         else:
-            print(f"  {i:>2}. {name:<50} \033[90mtimeout\033[0m")
+            out.append(f"  {i:>2}. {name:<50} \033[90mtimeout\033[0m")
 
-    if available:
-        best_name, best_delay = available[0]
-        print(f"\n  Best: {best_name} ({best_delay}ms)")
+    if top and top[0][1] >= 0:
+        best_name, best_delay = top[0]
+        out.append(f"\n  Best: {best_name} ({best_delay}ms)")
         result = api_request(f"/proxies/{encoded}", method="PUT", data={"name": best_name})
         if result is None:
-            print(f"  Switched [{group}] -> {best_name}")
+            out.append(f"  Switched [{group}] -> {best_name}")
         else:
-            print(f"  Error switching: {result}")
+            out.append(f"  Error switching: {result}")
     else:
-        print("\n  No available nodes!")
+        out.append("\n  No available nodes!")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def cmd_status():
     profiles = get_remote_profiles()
     active = next((p for p in profiles if p["active"]), None)
-    config = api_request("/configs")
-    proxies = api_request("/proxies")
 
-    print(f"\n{'='*60}")
-    print(f" Clash Verge Status")
-    print(f"{'='*60}\n")
-
-    ver = api_request("/version")
-    print(f"  Core:    mihomo {ver.get('version', '?')}")
-    print(f"  Mode:    {config.get('mode', '?')}")
-    print(f"  Port:    {config.get('mixed-port', '?')}")
+    # The API reads and profile parses are independent; run them side by side
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        f_config = pool.submit(api_get_cached, "/configs")
+        f_proxies = pool.submit(api_get_cached, "/proxies")
+        f_ver = pool.submit(api_get_cached, "/version")
+        node_counts = list(pool.map(_count_profile_nodes, profiles))
+        config, proxies, ver = f_config.result(), f_proxies.result(), f_ver.result()
+
+    out = []
+    out.append(f"\n{'='*60}")
+    out.append(f" Clash Verge Status")
+    out.append(f"{'='*60}\n")
+
+    out.append(f"  Core:    mihomo {ver.get('version', '?')}")
+    out.append(f"  Mode:    {config.get('mode', '?')}")
+    out.append(f"  Port:    {config.get('mixed-port', '?')}")
     tun = config.get("tun", {})
-    print(f"  TUN:     {'ON' if tun.get('enable') else 'OFF'} ({tun.get('device', '')})")
-    print()
+    out.append(f"  TUN:     {'ON' if tun.get('enable') else 'OFF'} ({tun.get('device', '')})")
+    out.append("")
 
-    print(f"  Profiles:")
-    for p in profiles:
+    out.append(f"  Profiles:")
+    for p, count in zip(profiles, node_counts):
         marker = " ★" if p["active"] else "  "
-        nodes = parse_profile_nodes(p)
-        print(f"  {marker} {p['name']:<15} {len(nodes)} nodes  [{p['uid'][:8]}]")
-    print()
+        out.append(f"  {marker} {p['name']:<15} {count} nodes  [{p['uid'][:8]}]")
+    out.append("")
 
     if proxies:
         # Show current selections for key groups
         key_groups = ["Proxies", "GLOBAL", "Telegram", "Netflix"]
-        print(f"  Current Selections:")
+        out.append(f"  Current Selections:")
         for g in key_groups:
             if g in proxies["proxies"]:
                 now = proxies["proxies"][g].get("now", "—")
-                print(f"    {g:<15} -> {now}")
-    print()
+                out.append(f"    {g:<15} -> {now}")
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def print_usage():